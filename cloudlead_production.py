@@ -1,17 +1,142 @@
 #!/usr/bin/env python3
+import asyncio
+import base64
+import hashlib
+import hmac
+import aiohttp
+import orjson
 import requests
-import openai
+from aiolimiter import AsyncLimiter
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import logging
 import os
+import queue
+from collections import OrderedDict
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
 from datetime import datetime
+from threading import Thread
 from flask import Flask, request, jsonify
+from flask.json.provider import JSONProvider
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # Import config
-from config import AIRTABLE_ACCESS_TOKEN, AIRTABLE_BASE_ID, OPENAI_API_KEY
+from config import (
+    AIRTABLE_ACCESS_TOKEN, AIRTABLE_BASE_ID, OPENAI_API_KEY,
+    AIRTABLE_WEBHOOK_URL, AIRTABLE_PROJECTS_TABLE_ID, OPENAI_RPM,
+    AIRTABLE_LAST_MODIFIED_FIELD
+)
+
+# Max projects processed at the same time
+PROJECT_CONCURRENCY = 4
+
+# Max concurrent OpenAI requests per generate_leads call (keeps us under RPM limits)
+OPENAI_CONCURRENCY = 8
+
+# LRU cache of AI analyses keyed on (company, website)
+AI_CACHE_SIZE = 1024
+_analysis_cache = OrderedDict()
+
+def _remember_analysis(key, analysis):
+    _analysis_cache[key] = analysis
+    if len(_analysis_cache) > AI_CACHE_SIZE:
+        _analysis_cache.popitem(last=False)
+
+OPENAI_API_URL = "https://api.openai.com/v1"
+
+# New projects are pushed here by the webhooks; None means "check Airtable now"
+project_queue = queue.Queue()
+
+# Seconds a webhook request waits for Airtable
+WEBHOOK_TIMEOUT = 30
+
+# Seconds a single async Airtable request may take
+AIRTABLE_REQUEST_TIMEOUT = 10
+
+# Project fields read by process_project
+PROJECT_FIELDS = ["Project Name", "Industry", "Lead Count"]
+
+# Safety-net poll interval in case a webhook is missed
+RECONCILE_INTERVAL = 300
+
+# Most stuck projects to re-check by id before get_new_projects falls back to a full 'New' query
+RECHECK_LIMIT = 50
+
+# Minimum seconds between webhook-triggered polls; pings in between share one poll
+PING_DEBOUNCE = 10
+
+# How many handled project ids to remember for skipping duplicate queue entries
+PROCESSED_IDS_LIMIT = 1000
+
+# Airtable allows 5 requests/sec per base
+AIRTABLE_RATE_LIMIT = 5
+
+# Rate-limit and transient server errors worth retrying
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+def _is_retryable(exc):
+    return isinstance(exc, aiohttp.ClientResponseError) and exc.status in RETRYABLE_STATUSES
+
+# Retry async API calls with jittered exponential backoff
+api_retry = retry(
+    retry=retry_if_exception(_is_retryable),
+    wait=wait_random_exponential(multiplier=0.5, max=30),
+    stop=stop_after_attempt(5),
+    reraise=True
+)
+
+# Shorter retry for webhook requests - 2 attempts of AIRTABLE_REQUEST_TIMEOUT plus backoff fit in WEBHOOK_TIMEOUT
+webhook_retry = retry(
+    retry=retry_if_exception(_is_retryable),
+    wait=wait_random_exponential(multiplier=0.5, max=2),
+    stop=stop_after_attempt(2),
+    reraise=True
+)
+
+# Demo lead templates per industry
+LEAD_TEMPLATES = {
+    "Technology": [
+        {"company": "TechFlow Inc", "name": "Sarah Chen", "title": "CTO", "email": "sarah@techflow.com", "phone": "+1-555-0101", "website": "techflow.com"},
+        {"company": "DataNova Systems", "name": "Michael Rodriguez", "title": "Engineering Director", "email": "michael@datanova.com", "website": "datanova.com"},
+        {"company": "CloudCraft", "name": "Jessica Williams", "title": "VP of Product", "email": "jessica@cloudcraft.com", "website": "cloudcraft.com"}
+    ],
+    "Finance": [
+        {"company": "CapitalFirst Bank", "name": "Robert Johnson", "title": "CFO", "email": "robert@capitalfirst.com", "website": "capitalfirst.com"},
+        {"company": "WealthBuild Advisors", "name": "Emily Davis", "title": "Investment Director", "email": "emily@wealthbuild.com", "website": "wealthbuild.com"}
+    ],
+    "Healthcare": [
+        {"company": "MedTech Solutions", "name": "Dr. James Wilson", "title": "Chief Medical Officer", "email": "james@medtech.com", "website": "medtech.com"},
+        {"company": "BioHealth Labs", "name": "Lisa Anderson", "title": "Research Director", "email": "lisa@biohealth.com", "website": "biohealth.com"}
+    ]
+}
+
+# Templates flattened once at import to (company, name, title, email_local, email_domain, phone, website)
+TEMPLATES = {
+    industry: tuple(
+        (t["company"], t["name"], t["title"], *t["email"].split("@"), t.get("phone", ""), t["website"])
+        for t in entries
+    )
+    for industry, entries in LEAD_TEMPLATES.items()
+}
+
+@dataclass
+class Lead:
+    """A generated lead; slotted since projects create many of them"""
+    __slots__ = ("company", "name", "title", "email", "phone", "website", "score", "analysis")
+    
+    company: str
+    name: str
+    title: str
+    email: str
+    phone: str
+    website: str
+    score: int
+    analysis: str
 
 class CloudLeadProduction:
     def __init__(self):
@@ -23,61 +148,249 @@ class CloudLeadProduction:
         }
         self.base_url = f"https://api.airtable.com/v0/{self.base_id}"
         
+        # Reuse keep-alive connections to Airtable across calls
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET", "PATCH"]
+        )
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=retry)
+        self.session.mount("https://", adapter)
+        
+        # Key for verifying Airtable webhook pings, set when we register the webhook
+        self.webhook_mac_secret = None
+        
+        # Long-lived event loop shared by the automation loop and webhook handlers
+        self.loop = asyncio.new_event_loop()
+        Thread(target=self.loop.run_forever, daemon=True).start()
+        
+        # aiohttp session for async Airtable/OpenAI calls, created on first use
+        self._http = None
+        
+        # Newest last-modified time seen by get_new_projects, and the projects it last
+        # returned - those are re-checked until they leave "New" so none get stuck behind the watermark
+        self._last_seen_modified = None
+        self._recheck_ids = set()
+        
+        # AI analyses currently being fetched, keyed on (company, website)
+        self._inflight = {}
+        
+        # Caps projects in flight across all process_projects calls; created on the loop
+        self._project_semaphore = None
+        
+        # Throttle Airtable and OpenAI calls client-side so we queue before hitting 429s
+        self._airtable_limiter = AsyncLimiter(AIRTABLE_RATE_LIMIT, 1)
+        self._openai_limiter = AsyncLimiter(1, 60 / OPENAI_RPM)
+        
         # Initialize OpenAI
         if OPENAI_API_KEY and OPENAI_API_KEY != 'your-openai-key-here':
-            openai.api_key = OPENAI_API_KEY
+            self.openai_headers = {
+                "Authorization": f"Bearer {OPENAI_API_KEY}",
+                "Content-Type": "application/json"
+            }
             self.ai_enabled = True
         else:
             self.ai_enabled = False
             logging.warning("OpenAI not configured - using simulated AI")
     
+    @property
+    def http(self):
+        """aiohttp session shared by all async API calls, kept open for the process lifetime"""
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=20))
+        return self._http
+    
+    def submit(self, coro):
+        """Schedule a coroutine on the shared event loop, returning a concurrent Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+    
+    def airtable_request(self, method, url, **kwargs):
+        """Blocking Airtable request that shares the async rate limiter - don't call it on the event loop"""
+        self.submit(self._airtable_limiter.acquire()).result()
+        return self.session.request(method, url, **kwargs)
+    
     def get_new_projects(self):
         """Get projects with status 'New' using Airtable filter"""
         try:
             logging.info("🔍 Checking for new projects...")
             
-            # Use Airtable's filter to get ONLY "New" projects
+            # Use Airtable's filter to get ONLY "New" projects, and only the fields we read
+            formula = "{Status} = 'New'"
+            fields = PROJECT_FIELDS
+            
+            # With a last-modified field, only ask for projects changed since the last one we saw
+            if AIRTABLE_LAST_MODIFIED_FIELD:
+                fields = PROJECT_FIELDS + [AIRTABLE_LAST_MODIFIED_FIELD]
+                # Too many stuck projects would make the URL too long - just ask for every 'New' one
+                if self._last_seen_modified and len(self._recheck_ids) <= RECHECK_LIMIT:
+                    changed = [f"IS_AFTER({{{AIRTABLE_LAST_MODIFIED_FIELD}}}, '{self._last_seen_modified}')"]
+                    changed += [f"RECORD_ID() = '{record_id}'" for record_id in sorted(self._recheck_ids)]
+                    formula = f"AND({formula}, OR({', '.join(changed)}))"
+            
             params = {
-                "filterByFormula": "{Status} = 'New'"
+                "filterByFormula": formula,
+                "fields[]": fields,
+                "pageSize": 100
             }
             
-            response = requests.get(
-                f"{self.base_url}/Projects", 
-                headers=self.headers, 
-                params=params
-            )
+            projects = []
+            while True:
+                response = self.airtable_request(
+                    "GET",
+                    f"{self.base_url}/Projects", 
+                    params=params
+                )
+                
+                if response.status_code != 200:
+                    logging.error(f"❌ Airtable API error: {response.status_code} - {response.text}")
+                    return []
+                
+                page = orjson.loads(response.content)
+                projects.extend(page.get("records", []))
+                
+                # Airtable returns an offset cursor while more pages remain
+                if not page.get("offset"):
+                    break
+                params["offset"] = page["offset"]
             
-            if response.status_code == 200:
-                projects = response.json().get("records", [])
-                logging.info(f"✅ Found {len(projects)} new projects")
-                return projects
-            else:
-                logging.error(f"❌ Airtable API error: {response.status_code} - {response.text}")
-                return []
+            if AIRTABLE_LAST_MODIFIED_FIELD:
+                modified = [p["fields"][AIRTABLE_LAST_MODIFIED_FIELD] for p in projects if AIRTABLE_LAST_MODIFIED_FIELD in p["fields"]]
+                if modified:
+                    self._last_seen_modified = max(modified + [self._last_seen_modified or ""])
+                self._recheck_ids = {p["id"] for p in projects}
+            
+            logging.info(f"✅ Found {len(projects)} new projects")
+            return projects
                 
         except Exception as e:
             logging.error(f"💥 Exception in get_new_projects: {str(e)}")
             return []
     
-    def ai_analyze(self, company_name, website=None):
+    def build_analysis_request(self, company_name, website=None):
+        """Chat completion body for a company analysis"""
+        prompt = f"Provide business intelligence analysis for {company_name}"
+        if website:
+            prompt += f" ({website})"
+        prompt += ". Focus on their market position, technology stack, and potential pain points. Keep it under 100 words."
+        
+        return {
+            "model": "gpt-3.5-turbo",
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": 150
+        }
+    
+    def get_status_field_id(self):
+        """Look up the id of the Projects Status field from the base schema"""
+        try:
+            response = self.airtable_request("GET", f"https://api.airtable.com/v0/meta/bases/{self.base_id}/tables")
+            if response.status_code != 200:
+                logging.error(f"❌ Failed to read base schema: {response.text}")
+                return None
+            
+            for table in orjson.loads(response.content).get("tables", []):
+                if table["id"] == AIRTABLE_PROJECTS_TABLE_ID:
+                    for field in table["fields"]:
+                        if field["name"] == "Status":
+                            return field["id"]
+            logging.error("❌ Status field not found on the Projects table")
+            return None
+        except Exception as e:
+            logging.error(f"💥 Error reading base schema: {e}")
+            return None
+    
+    def subscribe_to_projects(self):
+        """Register (or refresh) an Airtable webhook that pings us when a project's Status changes"""
+        if not AIRTABLE_PROJECTS_TABLE_ID:
+            # Without a table scope the webhook would also fire for every lead we write
+            logging.warning("⚠️ AIRTABLE_PROJECTS_TABLE_ID not set - not subscribing to Airtable webhooks")
+            return False
+        
+        filters = {
+            "dataTypes": ["tableData"],
+            "changeTypes": ["add", "update"],
+            "recordChangeScope": AIRTABLE_PROJECTS_TABLE_ID
+        }
+        status_field_id = self.get_status_field_id()
+        if status_field_id:
+            filters["watchDataInFieldIds"] = [status_field_id]
+        
+        webhook_data = {
+            "notificationUrl": AIRTABLE_WEBHOOK_URL,
+            "specification": {"options": {"filters": filters}}
+        }
+        webhooks_url = f"https://api.airtable.com/v0/bases/{self.base_id}/webhooks"
+        
+        try:
+            # Replace our webhook from a previous run instead of piling up new ones. It is
+            # recreated rather than refreshed because the MAC secret is only returned on creation.
+            response = self.airtable_request("GET", webhooks_url)
+            if response.status_code != 200:
+                logging.error(f"❌ Failed to list Airtable webhooks: {response.text}")
+                return False
+            
+            for webhook in orjson.loads(response.content).get("webhooks", []):
+                if webhook.get("notificationUrl") == AIRTABLE_WEBHOOK_URL:
+                    self.airtable_request("DELETE", f"{webhooks_url}/{webhook['id']}")
+            
+            response = self.airtable_request("POST", webhooks_url, data=orjson.dumps(webhook_data))
+            if response.status_code == 200:
+                webhook = orjson.loads(response.content)
+                self.webhook_mac_secret = base64.b64decode(webhook["macSecretBase64"])
+                logging.info(f"✅ Subscribed to Airtable webhook {webhook.get('id')}")
+                return True
+            else:
+                logging.error(f"❌ Failed to subscribe to Airtable webhook: {response.text}")
+                return False
+        except Exception as e:
+            logging.error(f"💥 Error subscribing to Airtable webhook: {e}")
+            return False
+    
+    async def ai_analyze_async(self, company_name, website=None):
         """AI analysis of companies"""
         if not self.ai_enabled:
             return "AI analysis will be enabled with OpenAI API key"
         
+        key = (company_name, website)
+        if key in _analysis_cache:
+            _analysis_cache.move_to_end(key)
+            return _analysis_cache[key]
+        
+        # Concurrent callers asking about the same company share one request
+        if key in self._inflight:
+            return await asyncio.shield(self._inflight[key])
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
         try:
-            prompt = f"Provide business intelligence analysis for {company_name}"
-            if website:
-                prompt += f" ({website})"
-            prompt += ". Focus on their market position, technology stack, and potential pain points. Keep it under 100 words."
+            try:
+                analysis = await self.post_chat(self.build_analysis_request(company_name, website))
+            except Exception as e:
+                analysis = f"AI analysis error: {str(e)}"
+            else:
+                _remember_analysis(key, analysis)
             
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=150
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            return f"AI analysis error: {str(e)}"
+            future.set_result(analysis)
+            return analysis
+        finally:
+            del self._inflight[key]
+            # Owner was cancelled - hand waiters an error result rather than cancelling them too
+            if not future.done():
+                future.set_result("AI analysis error: request cancelled")
+    
+    @api_retry
+    async def post_chat(self, payload):
+        """POST a chat completion to OpenAI and return the message content"""
+        async with self._openai_limiter:
+            async with self.http.post(
+                f"{OPENAI_API_URL}/chat/completions",
+                headers=self.openai_headers,
+                data=orjson.dumps(payload)
+            ) as response:
+                response.raise_for_status()
+                return orjson.loads(await response.read())["choices"][0]["message"]["content"]
     
     def update_project_status(self, project_id, status, leads_count=0):
         """Update project status"""
@@ -95,7 +408,7 @@ class CloudLeadProduction:
             update_data["records"][0]["fields"]["Date Completed"] = datetime.now().isoformat()
         
         try:
-            response = requests.patch(f"{self.base_url}/Projects", headers=self.headers, json=update_data)
+            response = self.airtable_request("PATCH", f"{self.base_url}/Projects", data=orjson.dumps(update_data))
             if response.status_code == 200:
                 logging.info(f"✅ Updated project {project_id} to {status}")
                 return True
@@ -106,83 +419,99 @@ class CloudLeadProduction:
             logging.error(f"💥 Error updating project: {e}")
             return False
     
-    def add_leads(self, project_id, leads):
+    async def post_airtable_once(self, table, payload):
+        """POST to an Airtable table once, returning (status, body text)"""
+        async with self._airtable_limiter:
+            async with self.http.post(
+                f"{self.base_url}/{table}", 
+                headers=self.headers, 
+                data=orjson.dumps(payload),
+                timeout=aiohttp.ClientTimeout(total=AIRTABLE_REQUEST_TIMEOUT)
+            ) as response:
+                # Only retry on 429 - a 5xx after a POST may already have created records
+                if response.status == 429:
+                    response.raise_for_status()
+                return response.status, await response.text()
+    
+    @api_retry
+    async def post_airtable(self, table, payload):
+        """POST to an Airtable table, returning (status, body text)"""
+        return await self.post_airtable_once(table, payload)
+    
+    @webhook_retry
+    async def create_project(self, fields):
+        """Create a project in Airtable, returning (status, body text)"""
+        return await self.post_airtable_once("Projects", {"records": [{"fields": fields}]})
+    
+    async def add_leads(self, project_id, leads):
         """Add leads to Airtable"""
         if not leads:
             logging.warning("⚠️ No leads to add")
             return True
             
-        records = []
-        for lead in leads:
-            records.append({
-                "fields": {
-                    "Company": lead['company'],
-                    "Website": lead.get('website', ''),
-                    "Name": lead['name'],
-                    "Title": lead['title'],
-                    "Email": lead['email'],
-                    "Phone": lead.get('phone', ''),
-                    "Status": "Verified",
-                    "Validation Score": lead.get('score', 85),
-                    "Last Verified": datetime.now().isoformat(),
-                    "Project": [project_id],
-                    "Notes": lead.get('analysis', '')
-                }
-            })
+        # Fields shared by every lead are serialized once; each record splices in its own fields
+        now = datetime.now().isoformat()
+        shared = orjson.dumps({"Status": "Verified", "Project": [project_id], "Last Verified": now})
+        prefix = b'{"fields":' + shared[:-1] + b","
+        records = [orjson.Fragment(prefix + orjson.dumps({
+            "Company": lead.company,
+            "Website": lead.website,
+            "Name": lead.name,
+            "Title": lead.title,
+            "Email": lead.email,
+            "Phone": lead.phone,
+            "Validation Score": lead.score,
+            "Notes": lead.analysis
+        })[1:] + b"}") for lead in leads]
+        
+        # Split into batches of 10 (Airtable limit) and send them concurrently
+        batches = [records[i:i+10] for i in range(0, len(records), 10)]
+        
+        async def post_batch(batch):
+            status, text = await self.post_airtable("Leads", {"records": batch})
+            if status == 200:
+                logging.info(f"✅ Added batch of {len(batch)} leads")
+                return True
+            logging.error(f"❌ Failed to add leads: {text}")
+            return False
         
         try:
-            # Split into batches of 10 (Airtable limit)
-            for i in range(0, len(records), 10):
-                batch = records[i:i+10]
-                response = requests.post(
-                    f"{self.base_url}/Leads", 
-                    headers=self.headers, 
-                    json={"records": batch}
-                )
-                
-                if response.status_code == 200:
-                    logging.info(f"✅ Added batch of {len(batch)} leads")
-                else:
-                    logging.error(f"❌ Failed to add leads: {response.text}")
-                    return False
-                    
-            return True
+            results = await asyncio.gather(*(post_batch(batch) for batch in batches))
+            return all(results)
             
         except Exception as e:
             logging.error(f"💥 Error adding leads: {e}")
             return False
     
-    def generate_leads(self, industry, count):
+    async def generate_leads(self, industry, count):
         """Generate realistic leads for demo"""
-        templates = {
-            "Technology": [
-                {"company": "TechFlow Inc", "name": "Sarah Chen", "title": "CTO", "email": "sarah@techflow.com", "phone": "+1-555-0101", "website": "techflow.com"},
-                {"company": "DataNova Systems", "name": "Michael Rodriguez", "title": "Engineering Director", "email": "michael@datanova.com", "website": "datanova.com"},
-                {"company": "CloudCraft", "name": "Jessica Williams", "title": "VP of Product", "email": "jessica@cloudcraft.com", "website": "cloudcraft.com"}
-            ],
-            "Finance": [
-                {"company": "CapitalFirst Bank", "name": "Robert Johnson", "title": "CFO", "email": "robert@capitalfirst.com", "website": "capitalfirst.com"},
-                {"company": "WealthBuild Advisors", "name": "Emily Davis", "title": "Investment Director", "email": "emily@wealthbuild.com", "website": "wealthbuild.com"}
-            ],
-            "Healthcare": [
-                {"company": "MedTech Solutions", "name": "Dr. James Wilson", "title": "Chief Medical Officer", "email": "james@medtech.com", "website": "medtech.com"},
-                {"company": "BioHealth Labs", "name": "Lisa Anderson", "title": "Research Director", "email": "lisa@biohealth.com", "website": "biohealth.com"}
-            ]
-        }
+        template = TEMPLATES.get(industry, TEMPLATES["Technology"])
+        size = len(template)
         
         leads = []
-        template = templates.get(industry, templates["Technology"])
-        
         for i in range(min(count, 20)):
-            lead = template[i % len(template)].copy()
-            lead['email'] = lead['email'].replace('@', f"{i}@")
-            lead['analysis'] = self.ai_analyze(lead['company'], lead.get('website'))
-            lead['score'] = 80 + (i % 20)
-            leads.append(lead)
+            company, name, title, email_local, email_domain, phone, website = template[i % size]
+            leads.append(Lead(
+                company, name, title, f"{email_local}{i}@{email_domain}",
+                phone, website, 80 + (i % 20), ""
+            ))
+        
+        # Run AI analysis once per distinct company, concurrently, bounded by a semaphore
+        semaphore = asyncio.Semaphore(OPENAI_CONCURRENCY)
+        
+        async def analyze(company, website):
+            async with semaphore:
+                return await self.ai_analyze_async(company, website)
+        
+        keys = list(dict.fromkeys((lead.company, lead.website) for lead in leads))
+        results = await asyncio.gather(*(analyze(*key) for key in keys))
+        analyses = dict(zip(keys, results))
+        for lead in leads:
+            lead.analysis = analyses[(lead.company, lead.website)]
         
         return leads
     
-    def process_project(self, project):
+    async def process_project(self, project):
         """Process a project end-to-end"""
         project_id = project["id"]
         fields = project["fields"]
@@ -190,52 +519,144 @@ class CloudLeadProduction:
         
         logging.info(f"🚀 Processing project: {project_name}")
         
-        # Update status to in progress
-        if not self.update_project_status(project_id, "In Progress"):
-            logging.error(f"❌ Failed to update project status to In Progress")
-            return
-        
-        # Generate leads
-        industry = fields.get("Industry", "Technology")
-        lead_count = fields.get("Lead Count", 10) or 10
-        leads = self.generate_leads(industry, lead_count)
+        # Update status to in progress while leads are generated
+        in_progress = asyncio.create_task(
+            asyncio.to_thread(self.update_project_status, project_id, "In Progress")
+        )
         
-        logging.info(f"📊 Generated {len(leads)} leads for {project_name}")
+        try:
+            # Generate leads
+            industry = fields.get("Industry", "Technology")
+            lead_count = fields.get("Lead Count", 10) or 10
+            leads = await self.generate_leads(industry, lead_count)
+            
+            logging.info(f"📊 Generated {len(leads)} leads for {project_name}")
+            
+            if not await in_progress:
+                logging.error(f"❌ Failed to update project status to In Progress")
+                return
+            
+            # Add to Airtable
+            added = await self.add_leads(project_id, leads)
+        except Exception as e:
+            # Let the In Progress update land first so Failed isn't overwritten
+            await asyncio.gather(in_progress, return_exceptions=True)
+            logging.error(f"💥 Error processing project {project_name}: {e!r}")
+            await asyncio.to_thread(self.update_project_status, project_id, "Failed")
+            return
         
-        # Add to Airtable
-        if self.add_leads(project_id, leads):
-            self.update_project_status(project_id, "Completed", len(leads))
+        if added:
+            await asyncio.to_thread(self.update_project_status, project_id, "Completed", len(leads))
             logging.info(f"✅ Completed project {project_name} with {len(leads)} leads")
         else:
-            self.update_project_status(project_id, "Failed")
+            await asyncio.to_thread(self.update_project_status, project_id, "Failed")
             logging.error(f"❌ Failed to process project {project_name}")
 
+    async def process_projects(self, projects):
+        """Process several projects concurrently, bounded by a shared semaphore"""
+        if self._project_semaphore is None:
+            self._project_semaphore = asyncio.Semaphore(PROJECT_CONCURRENCY)
+        
+        async def process(project):
+            async with self._project_semaphore:
+                await self.process_project(project)
+        
+        results = await asyncio.gather(*(process(p) for p in projects), return_exceptions=True)
+        for project, result in zip(projects, results):
+            if isinstance(result, BaseException):
+                logging.error(f"💥 Error processing project {project['id']}: {result!r}")
+    
     def run(self):
         """Main automation loop"""
         logging.info("🏁 Starting CloudLead Production Automation")
         
+        if AIRTABLE_WEBHOOK_URL:
+            self.subscribe_to_projects()
+        
+        # Recently handled projects, so a queued project also picked up by a poll isn't processed twice
+        processed_ids = OrderedDict()
+        
+        # Projects submitted but not finished yet, so a poll doesn't start them again
+        in_flight = set()
+        
+        # When the last poll ran, for debouncing webhook pings
+        last_poll = 0.0
+        
+        # Check Airtable once on startup
+        project_queue.put(None)
+        
         while True:
             try:
-                projects = self.get_new_projects()
+                try:
+                    project = project_queue.get(timeout=RECONCILE_INTERVAL)
+                except queue.Empty:
+                    project = None
                 
+                if project is None:
+                    # Our own status updates ping too - poll at most once per PING_DEBOUNCE
+                    wait = last_poll + PING_DEBOUNCE - time.monotonic()
+                    if wait > 0:
+                        time.sleep(wait)
+                    
+                    # Markers queued meanwhile are covered by this poll; queued projects go back in line
+                    queued = []
+                    while True:
+                        try:
+                            queued.append(project_queue.get_nowait())
+                        except queue.Empty:
+                            break
+                    for item in queued:
+                        if item is not None:
+                            project_queue.put(item)
+                    
+                    projects = self.get_new_projects()
+                    last_poll = time.monotonic()
+                elif project["id"] in processed_ids:
+                    continue
+                else:
+                    projects = [project]
+                
+                projects = [project for project in projects if project["id"] not in in_flight]
                 if projects:
                     logging.info(f"🎯 Processing {len(projects)} new projects")
-                    for project in projects:
-                        self.process_project(project)
+                    ids = {project["id"] for project in projects}
+                    for project_id in ids:
+                        processed_ids[project_id] = None
+                    while len(processed_ids) > PROCESSED_IDS_LIMIT:
+                        processed_ids.popitem(last=False)
+                    in_flight.update(ids)
+                    
+                    # Don't wait - the shared semaphore bounds how many projects run at once
+                    future = self.submit(self.process_projects(projects))
+                    future.add_done_callback(lambda _, ids=ids: in_flight.difference_update(ids))
                 else:
-                    logging.info("⏰ No new projects found. Checking again in 60 seconds.")
-                
-                time.sleep(60)
+                    logging.info("⏰ No new projects found. Waiting for webhooks.")
                 
             except KeyboardInterrupt:
                 logging.info("🛑 Automation stopped by user")
+                if self._http is not None:
+                    self.submit(self._http.close()).result()
+                self.loop.call_soon_threadsafe(self.loop.stop)
                 break
             except Exception as e:
                 logging.error(f"💥 Error in main loop: {e}")
                 time.sleep(60)
 
+# Shared instance so webhook requests reuse its connection pool
+automation = CloudLeadProduction()
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 # Create Flask app for webhooks
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 @app.route('/')
 def home():
@@ -246,50 +667,61 @@ def handle_project():
     """Handle incoming project requests from web forms"""
     try:
         data = request.json
-        automation = CloudLeadProduction()
         
         # Create project in Airtable
-        project_data = {
-            "records": [{
-                "fields": {
-                    "Project Name": data.get('project_name', 'New Project'),
-                    "Industry": data.get('industry', 'Technology'),
-                    "Region": data.get('region', 'Global'),
-                    "Lead Count": data.get('lead_count', 10),
-                    "Status": "New",
-                    "Date Created": datetime.now().isoformat()
-                }
-            }]
+        fields = {
+            "Project Name": data.get('project_name', 'New Project'),
+            "Industry": data.get('industry', 'Technology'),
+            "Region": data.get('region', 'Global'),
+            "Lead Count": data.get('lead_count', 10),
+            "Status": "New",
+            "Date Created": datetime.now().isoformat()
         }
         
-        response = requests.post(
-            f"{automation.base_url}/Projects",
-            headers=automation.headers,
-            json=project_data
-        )
+        # Runs on the shared loop so the warm aiohttp session and rate limiter are reused
+        future = automation.submit(automation.create_project(fields))
+        try:
+            status, text = future.result(timeout=WEBHOOK_TIMEOUT)
+        except FutureTimeoutError:
+            # Stop the create so a client retry can't end up with a duplicate project
+            future.cancel()
+            logging.error("❌ Webhook timed out creating project")
+            return jsonify({"status": "error", "message": "Timed out creating project"}), 504
         
-        if response.status_code == 200:
+        if status == 200:
             logging.info("✅ Project created via webhook")
+            project_queue.put(orjson.loads(text)["records"][0])
             return jsonify({"status": "success", "message": "Project created successfully"})
         else:
-            logging.error(f"❌ Webhook error: {response.text}")
-            return jsonify({"status": "error", "message": response.text}), 400
+            logging.error(f"❌ Webhook error: {text}")
+            return jsonify({"status": "error", "message": text}), 400
             
     except Exception as e:
         logging.error(f"💥 Webhook exception: {e}")
         return jsonify({"status": "error", "message": str(e)}), 500
 
+@app.route('/webhook/airtable', methods=['POST'])
+def handle_airtable_notification():
+    """Handle Airtable webhook pings - check for new projects right away"""
+    secret = automation.webhook_mac_secret
+    if secret:
+        expected = "hmac-sha256=" + hmac.new(secret, request.get_data(), hashlib.sha256).hexdigest()
+        if not hmac.compare_digest(expected, request.headers.get("X-Airtable-Content-MAC", "")):
+            logging.warning("⚠️ Rejected Airtable ping with a bad MAC")
+            return "", 401
+    
+    project_queue.put(None)
+    return "", 200
+
 if __name__ == "__main__":
     # Start web server for webhooks
-    from threading import Thread
     port = int(os.getenv('PORT', 5000))
     
-    # Start both web server and automation
-    Thread(target=lambda: app.run(host='0.0.0.0', port=port, debug=False)).start()
+    # Start both web server and automation (production runs gunicorn, see gunicorn.conf.py)
+    Thread(target=lambda: app.run(host='0.0.0.0', port=port, debug=False, threaded=True)).start()
     
     # Give web server a moment to start
     time.sleep(2)
     
     # Start automation
-    automation = CloudLeadProduction()
     automation.run()
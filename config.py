@@ -2,4 +2,14 @@ import os
 
 AIRTABLE_ACCESS_TOKEN = os.getenv('AIRTABLE_ACCESS_TOKEN')
 AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID')
-OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
\ No newline at end of file
+OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+
+# Public URL of /webhook/airtable - when set (with the Projects table id), an Airtable webhook is registered on startup
+AIRTABLE_WEBHOOK_URL = os.getenv('AIRTABLE_WEBHOOK_URL')
+AIRTABLE_PROJECTS_TABLE_ID = os.getenv('AIRTABLE_PROJECTS_TABLE_ID')
+
+# OpenAI requests/minute budget for client-side throttling
+OPENAI_RPM = int(os.getenv('OPENAI_RPM', 500))
+
+# Name of a "Last modified time" field on Projects - when set, polls only fetch projects changed since the last poll
+AIRTABLE_LAST_MODIFIED_FIELD = os.getenv('AIRTABLE_LAST_MODIFIED_FIELD')
\ No newline at end of file
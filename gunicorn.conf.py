@@ -0,0 +1,14 @@
+import os
+from threading import Thread
+
+bind = f"0.0.0.0:{os.getenv('PORT', 5000)}"
+
+# A single worker keeps one automation loop; threads serve webhooks concurrently
+worker_class = "gthread"
+workers = 1
+threads = int(os.getenv('WEB_THREADS', 8))
+
+def post_worker_init(worker):
+    """Run the automation loop inside the web worker"""
+    from cloudlead_production import automation
+    Thread(target=automation.run, daemon=True).start()